@@ -1,18 +1,34 @@
 import asyncio
+import heapq
+import threading
 import time
 import re
-from typing import List, Dict, Optional, Any
+from pathlib import Path
+from typing import Callable, List, Dict, Optional, Any, Tuple
+import orjson
 from wallet import CDPWallet
 from mcp import MalloryMCP
 from x402 import X402Gateway
 from contract import BountyForgeClient
 
+MOCK_BOUNTIES_FILE = Path(__file__).parent / "bounties" / "mock_bounties.json"
+MAX_HANDLED_BOUNTIES = 10_000
+
+_SOLANA_ADDR_RE = re.compile(r'\b[1-9A-HJ-NP-Za-km-z]{32,44}\b')
+_WORD_RE = re.compile(r'[a-z_]+')
+_WALLET_KEYWORDS = frozenset({'wallet', 'wallets', 'wallet_intelligence'})
+_TOKEN_KEYWORDS = frozenset({'token', 'tokens', 'screening', 'token_screening'})
+_SMART_LABEL_KEYWORDS = ('smart', 'whale', 'influencer')
+
 
 class BountyAgent:
     def __init__(self):
         self.discovered_bounties: List[Dict] = []
         self.last_analysis: Optional[Dict[str, Any]] = None
         self.min_reward_threshold = 500000
+        self._loop = asyncio.new_event_loop()
+        self._handled_ids: Dict[Any, None] = {}
+        self._wake = threading.Event()
         
         self.wallet = CDPWallet()
         self.wallet.configure()
@@ -28,30 +44,97 @@ class BountyAgent:
             wallet_keypair=signing_keypair
         )
 
-    def filter_bounties(self, bounties: List[Dict]) -> List[Dict]:
-        filtered = []
+    def _run(self, coro):
+        return self._loop.run_until_complete(coro)
+
+    def close(self):
+        if not self._loop.is_closed():
+            self._run(self.mcp.aclose())
+            self._run(self.x402.aclose())
+            self._run(self.contract.aclose())
+            self._loop.close()
+
+    def reason(self, description: str) -> Optional[Dict]:
+        return self._run(self.mcp.reason(description))
+
+    async def _aattest_and_submit(self, bounty_id: Any, solution_id: int, solution: str, solution_hash: bytes, log: Callable[[str], None]) -> Tuple[Dict, Optional[Dict]]:
+        log("Attesting...")
+        attestation = await self.contract.attest_solution(solution_id, solution, solution_hash)
+        log("Attested")
+
+        submission = None
+        if bounty_id:
+            log("Submitting...")
+            submission = await self.contract.submit_solution(bounty_id, solution_id, solution, solution_hash)
+            log("Submitted!")
+        return attestation, submission
+
+    def attest_and_submit(self, bounty_id: Any, solution_id: int, solution: str, solution_hash: bytes, log: Callable[[str], None] = print) -> Tuple[Dict, Optional[Dict]]:
+        return self._run(self._aattest_and_submit(bounty_id, solution_id, solution, solution_hash, log))
+
+    def wake(self):
+        self._wake.set()
+
+    def _wait(self, timeout: float):
+        if self._wake.wait(timeout):
+            self._wake.clear()
+            print("Scan triggered")
+
+    def _mark_handled(self, bounty_id: Any):
+        self._handled_ids[bounty_id] = None
+        if len(self._handled_ids) > MAX_HANDLED_BOUNTIES:
+            del self._handled_ids[next(iter(self._handled_ids))]
+
+    def _is_eligible(self, bounty: Dict) -> bool:
+        if bounty.get("status", "").lower() != "open":
+            return False
+        if bounty.get("reward", 0) < self.min_reward_threshold:
+            return False
+        bounty_id = bounty.get("id")
+        return bool(bounty_id) and bounty_id not in self._handled_ids
+
+    def _iter_filtered_unique(self, bounties: List[Dict]):
+        seen_ids = set()
         for bounty in bounties:
-            if bounty.get("status", "").lower() != "open":
+            if not self._is_eligible(bounty):
                 continue
-            if bounty.get("reward", 0) < self.min_reward_threshold:
+            bounty_id = bounty.get("id")
+            if bounty_id in seen_ids:
                 continue
-            filtered.append(bounty)
-        return filtered
+            seen_ids.add(bounty_id)
+            yield bounty
+
+    def load_mock_bounties(self) -> List[Dict]:
+        if not MOCK_BOUNTIES_FILE.exists():
+            return []
+        with open(MOCK_BOUNTIES_FILE, "rb") as f:
+            return orjson.loads(f.read())
+
+    async def aload_mock_bounties(self) -> List[Dict]:
+        return await asyncio.to_thread(self.load_mock_bounties)
+
+    async def _afetch_bounties(self) -> List[Dict]:
+        on_chain, mock = await asyncio.gather(
+            self.contract.get_open_bounties(),
+            self.aload_mock_bounties(),
+            return_exceptions=True
+        )
+        if isinstance(on_chain, BaseException):
+            print(f"Error fetching on-chain bounties: {on_chain}")
+            on_chain = []
+        if on_chain:
+            return on_chain
+        if isinstance(mock, BaseException):
+            print(f"Error loading mock bounties: {mock}")
+            return []
+        return mock
 
     def discover_bounties(self) -> List[Dict]:
         try:
-            on_chain_bounties = asyncio.run(self.contract.get_open_bounties())
-            filtered = self.filter_bounties(on_chain_bounties)
-            
-            seen_ids = set()
-            unique_bounties = []
-            for bounty in filtered:
-                bounty_id = bounty.get("id")
-                if bounty_id and bounty_id not in seen_ids:
-                    seen_ids.add(bounty_id)
-                    unique_bounties.append(bounty)
-            
-            return unique_bounties
+            all_bounties = self._run(self._afetch_bounties())
+            if len(all_bounties) <= 1:
+                return [bounty for bounty in all_bounties if self._is_eligible(bounty)]
+            return list(self._iter_filtered_unique(all_bounties))
         except Exception as e:
             print(f"Error discovering bounties: {e}")
             return []
@@ -59,12 +142,10 @@ class BountyAgent:
     def select_bounty(self, bounties: List[Dict]) -> Optional[Dict]:
         if not bounties:
             return None
-        sorted_bounties = sorted(bounties, key=lambda x: x.get("reward", 0), reverse=True)
-        return sorted_bounties[0]
+        return max(bounties, key=lambda x: x.get("reward", 0))
     
     def _extract_wallet_address(self, text: str) -> Optional[str]:
-        solana_pattern = r'\b[1-9A-HJ-NP-Za-km-z]{32,44}\b'
-        solana_match = re.search(solana_pattern, text)
+        solana_match = _SOLANA_ADDR_RE.search(text)
         if solana_match:
             addr = solana_match.group(0)
             if len(addr) >= 32:
@@ -78,7 +159,7 @@ class BountyAgent:
         for label in label_items:
             label_name = (label.get("label") or "").lower()
             confidence = float(label.get("confidence", 0))
-            if any(x in label_name for x in ["smart", "whale", "influencer"]):
+            if any(x in label_name for x in _SMART_LABEL_KEYWORDS):
                 score += 0.3 * confidence
         
         if pnl_summary:
@@ -138,10 +219,10 @@ class BountyAgent:
         bounty_type = (bounty.get("type") or bounty.get("bounty_type") or "").lower()
         
         if not bounty_type:
-            description = (bounty.get('description', '') or '').lower()
-            if any(word in description for word in ['wallet', 'analyze wallet', 'wallet intelligence']):
+            words = set(_WORD_RE.findall((bounty.get('description', '') or '').lower()))
+            if words & _WALLET_KEYWORDS:
                 bounty_type = "wallet_intelligence"
-            elif any(word in description for word in ['token', 'screening', 'find tokens']):
+            elif words & _TOKEN_KEYWORDS:
                 bounty_type = "token_screening"
         
         if bounty_type == "wallet_intelligence":
@@ -157,6 +238,25 @@ class BountyAgent:
         
         return f"Solution for bounty: {description}"
 
+    async def _gather_gateway_data(self, label: str, calls: Dict[str, Any]) -> tuple:
+        results = await asyncio.gather(*calls.values(), return_exceptions=True)
+        data = []
+        for name, result in zip(calls, results):
+            if isinstance(result, BaseException):
+                print(f"Error fetching {label} {name}: {result}")
+                result = None
+            data.append(result or {})
+        return tuple(data)
+
+    async def _afetch_wallet_data(self, wallet_address: str, chain: str) -> tuple:
+        return await self._gather_gateway_data("wallet", {
+            "balance": self.x402.aget_current_balance(wallet_address, chain),
+            "transactions": self.x402.aget_transactions(wallet_address, chain),
+            "pnl": self.x402.aget_pnl(wallet_address, chain),
+            "pnl summary": self.x402.aget_pnl_summary(wallet_address, chain),
+            "labels": self.x402.aget_labels(wallet_address, chain)
+        })
+
     def _generate_wallet_intelligence_solution(self, bounty: Dict, reason_result: Dict) -> Optional[str]:
         wallet_address = (
             bounty.get("wallet_address") or 
@@ -170,11 +270,7 @@ class BountyAgent:
 
         print(f"Analyzing wallet {wallet_address}...")
         
-        balance = self.x402.get_current_balance(wallet_address, chain) or {}
-        txs = self.x402.get_transactions(wallet_address, chain) or {}
-        pnl = self.x402.get_pnl(wallet_address, chain) or {}
-        pnl_summary = self.x402.get_pnl_summary(wallet_address, chain) or {}
-        labels = self.x402.get_labels(wallet_address, chain) or {}
+        balance, txs, pnl, pnl_summary, labels = self._run(self._afetch_wallet_data(wallet_address, chain))
 
         data_quality = {
             "has_balance": bool(balance.get("total_usd_value") is not None),
@@ -240,6 +336,12 @@ class BountyAgent:
         }
         return summary
 
+    async def _afetch_screening_data(self, chain: str, filters: Dict) -> tuple:
+        return await self._gather_gateway_data("screening", {
+            "netflows": self.x402.aget_smart_money_netflows([chain]),
+            "screener": self.x402.aget_token_screener(chain, filters, page=1, per_page=10)
+        })
+
     def _generate_token_screening_solution(self, bounty: Dict, reason_result: Dict) -> Optional[str]:
         chain = bounty.get("chain", "solana")
         filters = {
@@ -250,13 +352,15 @@ class BountyAgent:
 
         print(f"Screening tokens on {chain}...")
         
-        netflows = self.x402.get_smart_money_netflows([chain]) or {}
-        screener = self.x402.get_token_screener(chain, filters, page=1, per_page=10) or {}
+        netflows, screener = self._run(self._afetch_screening_data(chain, filters))
         tokens = screener.get("tokens", []) if isinstance(screener, dict) else []
 
         ranked_tokens = []
         net_items = netflows.get("netflows", []) if isinstance(netflows, dict) else []
         netflow_map = {item.get("token_address"): item for item in net_items[:20]} if net_items else {}
+        volume_bar = filters["min_volume_usd"] * 2
+        holders_bar = filters["min_holders"] * 2
+        growth_bar = filters["min_holder_growth"] * 2
 
         for token in tokens:
             token_address = token.get("token_address") or token.get("token")
@@ -269,11 +373,11 @@ class BountyAgent:
             inflow = float(netflow_data.get("netflow_usd", 0))
             
             confidence = 0.5
-            if volume > filters["min_volume_usd"] * 2:
+            if volume > volume_bar:
                 confidence += 0.2
-            if holders > filters["min_holders"] * 2:
+            if holders > holders_bar:
                 confidence += 0.15
-            if growth > filters["min_holder_growth"] * 2:
+            if growth > growth_bar:
                 confidence += 0.15
             if inflow > 0:
                 confidence += 0.1
@@ -288,8 +392,7 @@ class BountyAgent:
                 "price_change": price_change
             })
 
-        ranked_tokens.sort(key=lambda x: (x["confidence"], x["inflow"]), reverse=True)
-        top_tokens = ranked_tokens[:5]
+        top_tokens = heapq.nlargest(5, ranked_tokens, key=lambda x: (x["confidence"], x["inflow"]))
 
         lines = [
             "=" * 80,
@@ -333,29 +436,35 @@ class BountyAgent:
                 bounties = self.discover_bounties()
                 
                 if bounties:
-                    print(f"Found {len(bounties)} bounties")
                     selected = self.select_bounty(bounties)
+                    lines = [f"Found {len(bounties)} bounties"]
+                    description = (selected.get('description') or '') if selected else ''
+                    if selected:
+                        lines += [
+                            "",
+                            f"Bounty #{selected.get('id')}: {description[:60]}...",
+                            f"Reward: {selected.get('reward', 0) / 1e6:.2f} USDC"
+                        ]
+                    print("\n".join(lines))
                     
                     if selected:
                         bounty_id = selected.get('id')
-                        print(f"\nBounty #{bounty_id}: {selected.get('description')[:60]}...")
-                        print(f"Reward: {selected.get('reward', 0) / 1e6:.2f} USDC")
-                        
-                        reason_result = self.mcp.reason(selected.get('description', ''))
+                        reason_result = self.reason(description)
                         needs = reason_result.get('needs', []) if reason_result else []
                         
                         solution = self.generate_solution(selected, reason_result or {}, needs)
+                        self._mark_handled(bounty_id)
                         if solution:
                             print(f"\n{solution}\n")
                 else:
                     print("No bounties found")
                 
                 print(f"Waiting {interval_seconds}s...\n")
-                time.sleep(interval_seconds)
+                self._wait(interval_seconds)
                 
             except KeyboardInterrupt:
                 print("\nAgent stopped")
                 break
             except Exception as e:
                 print(f"Error: {e}")
-                time.sleep(interval_seconds)
\ No newline at end of file
+                self._wait(interval_seconds)
\ No newline at end of file
@@ -1,15 +1,19 @@
-from flask import Flask, jsonify, request
+from flask import Flask, request
 from flask_cors import CORS
 from service import service
-import asyncio
+import orjson
 
 app = Flask(__name__)
 CORS(app)
 
 
+def json_response(payload, status: int = 200):
+    return app.response_class(orjson.dumps(payload), status=status, mimetype='application/json')
+
+
 @app.route('/health', methods=['GET'])
 def health():
-    return jsonify({"status": "ok"})
+    return json_response({"status": "ok"})
 
 
 @app.route('/trigger', methods=['POST'])
@@ -17,26 +21,26 @@ def trigger():
     data = request.get_json() or {}
     single_run = data.get('single_run', True)
     result = service.start_agent(single_run=single_run)
-    return jsonify(result)
+    return json_response(result)
 
 
 @app.route('/stop', methods=['POST'])
 def stop():
     result = service.stop_agent()
-    return jsonify(result)
+    return json_response(result)
 
 
 @app.route('/logs', methods=['GET'])
 def get_logs():
     limit = request.args.get('limit', 100, type=int)
     logs = service.get_logs(limit=limit)
-    return jsonify({"logs": logs})
+    return json_response({"logs": logs})
 
 
 @app.route('/bounties', methods=['GET'])
 def get_bounties():
     bounties = service.get_bounties()
-    return jsonify({"bounties": bounties})
+    return json_response({"bounties": bounties})
 
 
 @app.route('/reputation', methods=['GET'])
@@ -50,21 +54,21 @@ def get_reputation():
                 service.signing_address = agent_address
     
     if not agent_address:
-        return jsonify({"reputation": {"score": 0, "successful_bounties": 0, "failed_bounties": 0, "total_earned": 0}})
+        return json_response({"reputation": {"score": 0, "successful_bounties": 0, "failed_bounties": 0, "total_earned": 0}})
     
     try:
-        reputation = asyncio.run(service.get_reputation(agent_address))
+        reputation = service.run_coroutine(service.get_reputation(agent_address))
         if reputation is None:
-            return jsonify({"reputation": {"score": 0, "successful_bounties": 0, "failed_bounties": 0, "total_earned": 0}})
-        return jsonify({"reputation": reputation})
+            return json_response({"reputation": {"score": 0, "successful_bounties": 0, "failed_bounties": 0, "total_earned": 0}})
+        return json_response({"reputation": reputation})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}, 500)
 
 
 @app.route('/status', methods=['GET'])
 def get_status():
     status = service.get_status()
-    return jsonify(status)
+    return json_response(status)
 
 
 @app.route('/wallet', methods=['GET'])
@@ -78,13 +82,13 @@ def get_wallet():
             service.signing_address = signing_address
     
     if cdp_address or signing_address:
-        return jsonify({
+        return json_response({
             "cdp_wallet_address": cdp_address,
             "signing_address": signing_address,
             "status": "ready"
         })
     else:
-        return jsonify({
+        return json_response({
             "cdp_wallet_address": None,
             "signing_address": None,
             "status": "not_initialized"
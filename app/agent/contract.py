@@ -1,46 +1,140 @@
+import asyncio
+import functools
 import hashlib
-from typing import Optional, Dict, List
+import logging
+import secrets
+import struct
+import time
+import traceback
+from pathlib import Path
+from typing import Optional, Dict, List, Union
+from anchorpy import Idl, Program, Provider
 from solders.pubkey import Pubkey
 from solders.keypair import Keypair as SoldersKeypair
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Confirmed
 import os
 
+logger = logging.getLogger(__name__)
+
+OPEN_BOUNTIES_TTL = 30
+# Reputation account: 8-byte discriminator, agent pubkey, then four u64 counters
+_REP_STRUCT = struct.Struct('<QQQQ')
+_REP_FIELDS_OFFSET = 8 + 32
+_REP_DISCRIMINATOR = hashlib.sha256(b"account:Reputation").digest()[:8]
+_U64LE = struct.Struct('<Q').pack
+_SEED_ATTEST = b"attest"
+_SEED_BOUNTY = b"bounty"
+_SEED_REP = b"rep"
+IDL_CANDIDATES = (
+    str(Path(__file__).parent.parent.parent / "target" / "idl" / "bountyforge.json"),
+    os.path.join(os.getcwd(), "target", "idl", "bountyforge.json"),
+    str(Path(__file__).parent.parent.parent.parent / "target" / "idl" / "bountyforge.json"),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _derive_attestation_pda(solution_id: int, program_id: Pubkey) -> tuple[Pubkey, int]:
+    return Pubkey.find_program_address([_SEED_ATTEST, _U64LE(solution_id)], program_id)
+
+
+@functools.lru_cache(maxsize=1024)
+def _derive_bounty_pda(bounty_id: int, program_id: Pubkey) -> tuple[Pubkey, int]:
+    return Pubkey.find_program_address([_SEED_BOUNTY, _U64LE(bounty_id)], program_id)
+
+
+@functools.lru_cache(maxsize=1024)
+def _derive_reputation_pda(agent_pubkey: Pubkey, program_id: Pubkey) -> tuple[Pubkey, int]:
+    return Pubkey.find_program_address([_SEED_REP, bytes(agent_pubkey)], program_id)
+
+
+@functools.lru_cache(maxsize=1)
+def _find_idl_path() -> Optional[str]:
+    return next((path for path in IDL_CANDIDATES if os.path.isfile(path)), None)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_idl(idl_path: str) -> Idl:
+    with open(idl_path, "r") as f:
+        return Idl.from_json(f.read())
+
 
 class BountyForgeClient:
     def __init__(self, program_id: str = "9Y6Z41eWLsfc8kY73WLBNeRN1NuiTBuMoADEecXGKnpZ", wallet_address: Optional[str] = None, wallet_keypair: Optional[SoldersKeypair] = None):
         self.program_id = program_id
+        self._program_pk = Pubkey.from_string(program_id)
         self.wallet_address = wallet_address
         self.wallet_keypair = wallet_keypair
+        self._open_bounties_cache: Optional[tuple] = None
+        self._client: Optional[AsyncClient] = None
+        self._client_lock = asyncio.Lock()
+        self._idl_path = _find_idl_path()
+        self._program: Optional[Program] = None
+    
+    async def _get_client(self) -> AsyncClient:
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    self._client = AsyncClient(os.getenv("SOLANA_RPC_URL", "https://api.devnet.solana.com"))
+        return self._client
+    
+    async def _get_program(self) -> Program:
+        if self._program is None:
+            provider = Provider(await self._get_client(), None)
+            if self._idl_path:
+                self._program = Program(_load_idl(self._idl_path), self._program_pk, provider)
+            else:
+                self._program = await Program.at(self._program_pk, provider)
+        return self._program
+    
+    async def aclose(self):
+        self._program = None
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.aclose()
         
-    def hash_solution(self, solution: str) -> bytes:
-        return hashlib.sha256(solution.encode()).digest()
+    def hash_solution(self, solution: Union[str, bytes]) -> bytes:
+        data = solution.encode() if isinstance(solution, str) else solution
+        return hashlib.sha256(data).digest()
     
     def generate_solution_id(self) -> int:
-        import random
-        return random.randint(1, 2**63 - 1)
+        return secrets.randbits(63) or 1
     
     def _derive_attestation_pda(self, solution_id: int, program_id: Pubkey) -> tuple[Pubkey, int]:
-        solution_id_buffer = solution_id.to_bytes(8, 'little')
-        seeds = [b"attest", solution_id_buffer]
-        return Pubkey.find_program_address_sync(seeds, program_id)
+        return _derive_attestation_pda(solution_id, program_id)
     
     def _derive_bounty_pda(self, bounty_id: int, program_id: Pubkey) -> tuple[Pubkey, int]:
-        bounty_id_buffer = bounty_id.to_bytes(8, 'little')
-        seeds = [b"bounty", bounty_id_buffer]
-        return Pubkey.find_program_address_sync(seeds, program_id)
+        return _derive_bounty_pda(bounty_id, program_id)
     
     def _derive_reputation_pda(self, agent_pubkey: Pubkey, program_id: Pubkey) -> tuple[Pubkey, int]:
-        seeds = [b"rep", bytes(agent_pubkey)]
-        return Pubkey.find_program_address_sync(seeds, program_id)
+        return _derive_reputation_pda(agent_pubkey, program_id)
     
-    async def attest_solution(self, solution_id: int, solution: str) -> Dict:
-        return {"solution_id": solution_id, "solution_hash": self.hash_solution(solution).hex()}
+    async def attest_solution(self, solution_id: int, solution: str, solution_hash: Optional[bytes] = None) -> Dict:
+        if solution_hash is None:
+            solution_hash = self.hash_solution(solution)
+        return {"solution_id": solution_id, "solution_hash": solution_hash}
     
-    async def submit_solution(self, bounty_id: int, solution_id: int, solution: str) -> Dict:
-        return {"bounty_id": bounty_id, "solution_id": solution_id, "solution_hash": self.hash_solution(solution).hex()}
+    async def submit_solution(self, bounty_id: int, solution_id: int, solution: str, solution_hash: Optional[bytes] = None) -> Dict:
+        if solution_hash is None:
+            solution_hash = self.hash_solution(solution)
+        return {"bounty_id": bounty_id, "solution_id": solution_id, "solution_hash": solution_hash}
     
     async def get_open_bounties(self) -> List[Dict]:
+        now = time.monotonic()
+        if self._open_bounties_cache and self._open_bounties_cache[0] > now:
+            bounties = self._open_bounties_cache[1]
+        else:
+            bounties = await self._fetch_open_bounties()
+            self._open_bounties_cache = (now + OPEN_BOUNTIES_TTL, bounties)
+        return [dict(bounty) for bounty in bounties]
+    
+    async def _fetch_open_bounties(self) -> List[Dict]:
         bounties = [
             {
                 "id": 100,
@@ -77,26 +171,19 @@ class BountyForgeClient:
         Get reputation for an agent address. Works even without IDL by using raw account data.
         """
         try:
-            from solders.pubkey import Pubkey
-            from solana.rpc.async_api import AsyncClient
-            import os
-            import struct
-            
-            rpc_url = os.getenv("SOLANA_RPC_URL", "https://api.devnet.solana.com")
-            client = AsyncClient(rpc_url)
-            program_id = Pubkey.from_string(self.program_id)
+            client = await self._get_client()
             
             try:
                 agent_pubkey = Pubkey.from_string(agent_address)
-                seeds = [b"rep", bytes(agent_pubkey)]
-                rep_pda, _ = Pubkey.find_program_address(seeds, program_id)
+                rep_pda, _ = self._derive_reputation_pda(agent_pubkey, self._program_pk)
                 
                 account_info = await client.get_account_info(rep_pda)
                 
                 if account_info.value is None:
-                    print(f"Reputation PDA not found on-chain for {agent_address}")
-                    print(f"   PDA: {rep_pda}")
-                    print(f"   This is expected if no solutions have been submitted on-chain yet")
+                    logger.debug(
+                        "Reputation PDA %s not found on-chain for %s (expected before any on-chain submission)",
+                        rep_pda, agent_address
+                    )
                     return {
                         "score": 0,
                         "successful_bounties": 0,
@@ -104,12 +191,20 @@ class BountyForgeClient:
                         "total_earned": 0
                     }
                 
-                # Try to decode using IDL if available
+                account_data = account_info.value.data
+                if account_data[:8] == _REP_DISCRIMINATOR and len(account_data) >= _REP_FIELDS_OFFSET + _REP_STRUCT.size:
+                    score, successful, failed, total_earned = _REP_STRUCT.unpack_from(account_data, _REP_FIELDS_OFFSET)
+                    return {
+                        "score": score,
+                        "successful_bounties": successful,
+                        "failed_bounties": failed,
+                        "total_earned": total_earned
+                    }
+                
+                # Unrecognised layout: fall back to the IDL decoder
                 try:
-                    from anchorpy import Program, Provider
-                    provider = Provider(client, None)
-                    program = await Program.at(program_id, provider)
-                    rep_data = program.coder.accounts.decode("Reputation", account_info.value.data)
+                    program = await self._get_program()
+                    rep_data = program.coder.accounts.decode("Reputation", account_data)
                     return {
                         "score": rep_data.score,
                         "successful_bounties": rep_data.successful_bounties,
@@ -117,45 +212,15 @@ class BountyForgeClient:
                         "total_earned": rep_data.total_earned
                     }
                 except Exception as idl_error:
-                    # Fallback: decode raw account data (assuming standard Anchor account layout)
-                    # Anchor accounts start with 8-byte discriminator, then the data
-                    print(f"IDL not available, using raw account data decoding: {idl_error}")
-                    account_data = account_info.value.data
-                    
-                    if len(account_data) < 8:
-                        print(f"Account data too short: {len(account_data)} bytes")
-                        return {
-                            "score": 0,
-                            "successful_bounties": 0,
-                            "failed_bounties": 0,
-                            "total_earned": 0
-                        }
-                    
-                    # Skip 8-byte discriminator, then read: u64 score, u64 successful, u64 failed, u64 total_earned
-                    # Assuming little-endian u64 values
-                    data = account_data[8:]  # Skip discriminator
-                    if len(data) >= 32:  # 4 * 8 bytes = 32 bytes
-                        score = struct.unpack('<Q', data[0:8])[0]  # u64
-                        successful = struct.unpack('<Q', data[8:16])[0]  # u64
-                        failed = struct.unpack('<Q', data[16:24])[0]  # u64
-                        total_earned = struct.unpack('<Q', data[24:32])[0]  # u64
-                        return {
-                            "score": score,
-                            "successful_bounties": successful,
-                            "failed_bounties": failed,
-                            "total_earned": total_earned
-                        }
-                    else:
-                        print(f"Account data too short for reputation struct: {len(data)} bytes")
-                        return {
-                            "score": 0,
-                            "successful_bounties": 0,
-                            "failed_bounties": 0,
-                            "total_earned": 0
-                        }
+                    print(f"Could not decode reputation account ({len(account_data)} bytes): {idl_error}")
+                    return {
+                        "score": 0,
+                        "successful_bounties": 0,
+                        "failed_bounties": 0,
+                        "total_earned": 0
+                    }
             except Exception as e:
                 print(f"Error fetching reputation: {e}")
-                import traceback
                 traceback.print_exc()
                 return {
                     "score": 0,
@@ -163,20 +228,7 @@ class BountyForgeClient:
                     "failed_bounties": 0,
                     "total_earned": 0
                 }
-            
-            score = int.from_bytes(data[32:40], 'little')
-            successful = int.from_bytes(data[40:48], 'little')
-            failed = int.from_bytes(data[48:56], 'little')
-            earned = int.from_bytes(data[56:64], 'little')
-            
-            return {
-                "score": score,
-                "successful_bounties": successful,
-                "failed_bounties": failed,
-                "total_earned": earned
-            }
         except Exception as e:
             print(f"Error fetching reputation: {e}")
-            import traceback
             traceback.print_exc()
             return None
\ No newline at end of file
@@ -0,0 +1,6 @@
+# Single worker: AgentService keeps the running agent, its logs and the
+# discovered bounties in process memory. Concurrency comes from threads.
+bind = "0.0.0.0:3003"
+workers = 1
+worker_class = "gthread"
+threads = 8
@@ -1,23 +1,37 @@
-import requests
+import httpx
+import orjson
 from typing import Dict, Optional
 
 
 class MalloryMCP:
     def __init__(self, base_url: str = "http://localhost:3001"):
         self.base_url = base_url
+        self._http: Optional[httpx.AsyncClient] = None
     
-    def reason(self, bounty_description: str, context: Optional[str] = None) -> Optional[Dict]:
+    def _get_http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=10),
+                timeout=10
+            )
+        return self._http
+    
+    async def reason(self, bounty_description: str, context: Optional[str] = None) -> Optional[Dict]:
         try:
-            response = requests.post(
+            response = await self._get_http().post(
                 f"{self.base_url}/mcp/reason",
                 json={
                     "bounty": bounty_description,
                     "context": context
-                },
-                timeout=10
+                }
             )
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return orjson.loads(response.content)
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
             print(f"MCP error: {e}")
             return None
+    
+    async def aclose(self):
+        if self._http is not None:
+            http, self._http = self._http, None
+            await http.aclose()
\ No newline at end of file
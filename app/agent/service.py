@@ -1,13 +1,24 @@
 import json
+import os
 import asyncio
+import atexit
+import itertools
 import threading
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Deque, Iterable, List, Dict, Optional
 from datetime import datetime
+import orjson
+from solders.keypair import Keypair as SoldersKeypair
 from agent import BountyAgent
+from contract import BountyForgeClient
 
 LOG_FILE = Path(__file__).parent / "logs" / "agent.log"
 LOG_FILE.parent.mkdir(exist_ok=True)
+LOG_FLUSH_BYTES = 4096
+LOG_FLUSH_INTERVAL = 0.1
+LOG_TAIL_LINE_BYTES = 512
+LOG_TAIL_MAX_BYTES = 8 << 20
 
 
 class AgentService:
@@ -15,32 +26,86 @@ class AgentService:
         self.agent: Optional[BountyAgent] = None
         self.is_running = False
         self.current_bounties: List[Dict] = []
-        self.log_buffer: List[Dict] = []
+        self.log_buffer: Deque[Dict] = deque(maxlen=1000)
         self.wallet_address: Optional[str] = None
         self.signing_address: Optional[str] = None
+        self._reputation_client = None
+        self._log_lock = threading.Lock()
+        self._log_fd: Optional[int] = os.open(str(LOG_FILE), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._log_pending = bytearray()
+        self._log_timer: Optional[threading.Timer] = None
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        atexit.register(self.shutdown)
         
     def write_log(self, level: str, message: str):
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "level": level,
-            "message": message
-        }
-        self.log_buffer.append(log_entry)
-        
-        with open(LOG_FILE, "a") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        self.write_logs(level, (message,))
+    
+    def write_logs(self, level: str, messages: Iterable[str]):
+        timestamp = datetime.now().isoformat()
+        data = bytearray()
+        for message in messages:
+            log_entry = {
+                "timestamp": timestamp,
+                "level": level,
+                "message": message
+            }
+            self.log_buffer.append(log_entry)
+            data += orjson.dumps(log_entry, option=orjson.OPT_APPEND_NEWLINE)
         
-        if len(self.log_buffer) > 1000:
-            self.log_buffer = self.log_buffer[-500:]
+        with self._log_lock:
+            self._log_pending += data
+            if len(self._log_pending) >= LOG_FLUSH_BYTES:
+                self._flush_locked()
+            elif self._log_timer is None:
+                self._log_timer = threading.Timer(LOG_FLUSH_INTERVAL, self.flush)
+                self._log_timer.daemon = True
+                self._log_timer.start()
+    
+    def _flush_locked(self):
+        if self._log_timer is not None:
+            self._log_timer.cancel()
+            self._log_timer = None
+        if self._log_pending and self._log_fd is not None:
+            with memoryview(self._log_pending) as view:
+                written = 0
+                while written < len(view):
+                    written += os.write(self._log_fd, view[written:])
+            del self._log_pending[:]
+    
+    def flush(self):
+        with self._log_lock:
+            self._flush_locked()
+    
+    def run_coroutine(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
+    def shutdown(self):
+        with self._log_lock:
+            self._flush_locked()
+            if self._log_fd is not None:
+                os.close(self._log_fd)
+                self._log_fd = None
+        if self._reputation_client is not None:
+            client, self._reputation_client = self._reputation_client, None
+            try:
+                self.run_coroutine(client.aclose())
+            except Exception as e:
+                print(f"Error closing reputation client: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
     
     def start_agent(self, single_run: bool = False):
         if self.is_running:
+            if self.agent:
+                self.agent.wake()
+                self.write_log("info", "Scan requested")
             return {"status": "already_running"}
         
         self.is_running = True
         self.write_log("info", "Agent started")
         
         def run_agent():
+            agent = None
             try:
                 agent = BountyAgent()
                 self.agent = agent
@@ -64,6 +129,8 @@ class AgentService:
             except Exception as e:
                 self.write_log("error", str(e))
             finally:
+                if agent:
+                    agent.close()
                 self.is_running = False
                 self.write_log("info", "Agent stopped")
         
@@ -83,28 +150,25 @@ class AgentService:
                 selected = agent.select_bounty(bounties)
                 
                 if selected:
-                    self.write_log("info", f"Selected bounty #{selected.get('id')}")
+                    description = selected.get('description') or ''
+                    self.write_logs("info", (
+                        f"Selected bounty #{selected.get('id')}",
+                        f"Bounty #{selected.get('id')}: {description[:60]}..."
+                    ))
                     
-                    reason_result = agent.mcp.reason(selected.get('description', ''))
+                    reason_result = agent.reason(description)
                     needs = reason_result.get('needs', []) if reason_result else []
                     
                     solution = agent.generate_solution(selected, reason_result or {}, needs)
                     if solution:
-                        self.write_log("info", f"Generated solution")
-                        
                         solution_id = agent.contract.generate_solution_id()
+                        solution_hash = agent.contract.hash_solution(solution)
+                        self.write_log("info", f"Generated solution {solution_hash.hex()[:16]}")
                         
-                        self.write_log("info", f"Attesting...")
-                        attestation = asyncio.run(agent.contract.attest_solution(solution_id, solution))
-                        self.write_log("info", f"Attested")
-                        
-                        bounty_id = selected.get('id')
-                        if bounty_id:
-                            self.write_log("info", f"Submitting...")
-                            submission = asyncio.run(agent.contract.submit_solution(
-                                bounty_id, solution_id, solution
-                            ))
-                            self.write_log("info", "Submitted!")
+                        attestation, submission = agent.attest_and_submit(
+                            selected.get('id'), solution_id, solution, solution_hash,
+                            log=lambda message: self.write_log("info", message)
+                        )
             else:
                 self.write_log("info", "No bounties found")
         except Exception as e:
@@ -115,20 +179,38 @@ class AgentService:
             return {"status": "not_running"}
         self.is_running = False
         self.write_log("info", "Stop requested")
+        self.flush()
         return {"status": "stopped"}
     
+    def _tail_lines(self, limit: int) -> List[bytes]:
+        size = os.path.getsize(LOG_FILE)
+        window = limit * LOG_TAIL_LINE_BYTES
+        with open(LOG_FILE, "rb") as f:
+            while True:
+                start = max(0, size - window)
+                f.seek(start)
+                lines = f.read().splitlines()
+                if start > 0 and lines:
+                    lines = lines[1:]
+                if len(lines) >= limit or start == 0 or window >= LOG_TAIL_MAX_BYTES:
+                    return lines[-limit:]
+                window *= 2
+    
     def get_logs(self, limit: int = 100) -> List[Dict]:
+        self.flush()
         if LOG_FILE.exists():
-            logs = []
-            with open(LOG_FILE, "r") as f:
-                lines = f.readlines()
-                for line in lines[-limit:]:
+            lines = [line for line in self._tail_lines(limit) if line.strip()]
+            try:
+                return [orjson.loads(line) for line in lines]
+            except orjson.JSONDecodeError:
+                logs = []
+                for line in lines:
                     try:
-                        logs.append(json.loads(line.strip()))
-                    except:
-                        pass
-            return logs
-        return self.log_buffer[-limit:]
+                        logs.append(orjson.loads(line))
+                    except orjson.JSONDecodeError:
+                        continue
+                return logs
+        return list(itertools.islice(self.log_buffer, max(0, len(self.log_buffer) - limit), None))
     
     def get_bounties(self) -> List[Dict]:
         return self.current_bounties
@@ -148,19 +230,13 @@ class AgentService:
         }
     
     def get_wallet_address(self) -> Optional[str]:
-        if self.agent and self.agent.wallet:
-            address = self.agent.wallet.get_address()
-            if address:
-                self.wallet_address = address
-            return address or self.wallet_address
+        if not self.wallet_address and self.agent and self.agent.wallet:
+            self.wallet_address = self.agent.wallet.get_address()
         return self.wallet_address
     
     def get_signing_address_from_keypair(self) -> Optional[str]:
         """Get signing address from persisted keypair file, even if agent isn't running"""
         try:
-            from solders.keypair import Keypair as SoldersKeypair
-            import json
-            
             keypair_path = Path(__file__).parent / ".agent_keypair.json"
             
             if keypair_path.exists():
@@ -175,15 +251,15 @@ class AgentService:
         return None
     
     async def get_reputation(self, agent_address: str) -> Optional[Dict]:
-        if not self.agent:
-            try:
-                from contract import BountyForgeClient
-                contract = BountyForgeClient()
-                return await contract.get_reputation(agent_address)
-            except Exception as e:
-                print(f"Error creating contract client for reputation query: {e}")
-                return None
-        return await self.agent.contract.get_reputation(agent_address)
+        # Runs on the service loop, so it keeps its own client instead of
+        # borrowing agent.contract, which lives on the agent's loop.
+        try:
+            if self._reputation_client is None:
+                self._reputation_client = BountyForgeClient()
+            return await self._reputation_client.get_reputation(agent_address)
+        except Exception as e:
+            print(f"Error creating contract client for reputation query: {e}")
+            return None
 
 
 service = AgentService()
\ No newline at end of file
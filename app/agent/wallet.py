@@ -20,6 +20,7 @@ class CDPWallet:
         self.client = None
         self.wallet = None
         self._configured = False
+        self._signing_keypair = None
         
     def configure(self) -> bool:
         if CdpClient is None:
@@ -87,6 +88,8 @@ class CDPWallet:
             return None
     
     def get_signing_keypair(self) -> Optional['SoldersKeypair']:
+        if self._signing_keypair is not None:
+            return self._signing_keypair
         try:
             from solders.keypair import Keypair as SoldersKeypair
             import json
@@ -127,6 +130,7 @@ class CDPWallet:
             # Try to read existing keypair
             keypair = read_keypair()
             if keypair:
+                self._signing_keypair = keypair
                 return keypair
             
             # Create new keypair if file doesn't exist or is invalid
@@ -137,6 +141,7 @@ class CDPWallet:
             print(f"IMPORTANT: Fund this address with SOL for transaction fees!")
             print(f"   Address: {keypair.pubkey()}")
             print(f"   Keypair saved to: {keypair_path}")
+            self._signing_keypair = keypair
             return keypair
         except Exception as e:
             print(f"Error with signing keypair: {e}")
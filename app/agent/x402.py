@@ -1,55 +1,196 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+import httpx
+import orjson
 import requests
-from typing import Dict, Optional, Any, List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Optional, Any, List, Union
+
+CACHE_MAXSIZE = 512
+CACHE_TTL = 60
+PAYMENT_UNITS = 1_000_000
+NANSEN_PAYMENT = 10_000
 
 
 class X402Gateway:
+    _BASE_HEADERS = {"Content-Type": "application/json", "Accept-Encoding": "gzip, deflate"}
+    _PAYMENT_STR_CACHE: Dict[int, str] = {}
+
     def __init__(self, base_url: str = "http://localhost:3002"):
         self.base_url = base_url.rstrip("/")
+        self._session = requests.Session()
+        self._session.headers["Connection"] = "keep-alive"
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=Retry(total=3, backoff_factor=0.2))
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._encoding_logged = False
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._cache_lock = threading.RLock()
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _get_http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=15,
+                headers=self._BASE_HEADERS
+            )
+        return self._http
 
-    def _post(self, path: str, payment: float, payload: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
+    async def aclose(self):
+        if self._http is not None:
+            http, self._http = self._http, None
+            await http.aclose()
+
+    def _payment_header(self, payment: Union[int, float]) -> str:
+        if isinstance(payment, float):
+            payment = round(payment * PAYMENT_UNITS)
+        value = self._PAYMENT_STR_CACHE.get(payment)
+        if value is None:
+            whole, frac = divmod(payment, PAYMENT_UNITS)
+            value = self._PAYMENT_STR_CACHE.setdefault(payment, f"{whole}.{frac:06d}")
+        return value
+
+    def _post(self, path: str, payment: Union[int, float], payload: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
         url = f"{self.base_url}{path}"
         try:
-            response = requests.post(
+            response = self._session.post(
                 url,
-                headers={
-                    "X-402-Payment": str(payment),
-                    "Content-Type": "application/json"
-                },
+                headers={**self._BASE_HEADERS, "X-402-Payment": self._payment_header(payment)},
                 json=payload or {},
                 timeout=15
             )
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            if not self._encoding_logged:
+                self._encoding_logged = True
+                print(f"Gateway response encoding: {response.headers.get('Content-Encoding', 'identity')}")
+            return orjson.loads(response.content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            print(f"Gateway error {path}: {e}")
+            return None
+
+    def _cache_key(self, path: str, payload: Dict[str, Any]) -> tuple:
+        return (path, orjson.dumps(payload, option=orjson.OPT_SORT_KEYS))
+
+    def _cache_get(self, key: tuple) -> Optional[Dict]:
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit is None:
+                return None
+            if hit[0] <= time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return hit[1]
+
+    def _cache_put(self, key: tuple, result: Optional[Dict], ttl: float):
+        if result is None:
+            return
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + ttl, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > CACHE_MAXSIZE:
+                self._cache.popitem(last=False)
+
+    def invalidate(self, path: Optional[str] = None):
+        with self._cache_lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                for key in [k for k in self._cache if k[0] == path]:
+                    del self._cache[key]
+
+    def _cached_post(self, path: str, payment: Union[int, float], payload: Dict[str, Any], ttl: float = CACHE_TTL) -> Optional[Dict]:
+        key = self._cache_key(path, payload)
+        hit = self._cache_get(key)
+        if hit is not None:
+            return hit
+        result = self._post(path, payment, payload)
+        self._cache_put(key, result, ttl)
+        return result
+
+    async def _acached_post(self, path: str, payment: Union[int, float], payload: Dict[str, Any], ttl: float = CACHE_TTL) -> Optional[Dict]:
+        key = self._cache_key(path, payload)
+        hit = self._cache_get(key)
+        if hit is not None:
+            return hit
+        result = await self._apost(path, payment, payload)
+        self._cache_put(key, result, ttl)
+        return result
+
+    async def _apost(self, path: str, payment: Union[int, float], payload: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
+        try:
+            response = await self._get_http().post(
+                f"{self.base_url}{path}",
+                headers={"X-402-Payment": self._payment_header(payment)},
+                content=orjson.dumps(payload or {})
+            )
+            response.raise_for_status()
+            return orjson.loads(response.content)
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
             print(f"Gateway error {path}: {e}")
             return None
 
     def get_current_balance(self, address: str, chain: str = "solana") -> Optional[Dict]:
-        return self._post("/api/nansen/current-balance", 0.01, {"address": address, "chain": chain})
+        return self._cached_post("/api/nansen/current-balance", NANSEN_PAYMENT, {"address": address, "chain": chain})
 
     def get_transactions(self, address: str, chain: str = "solana", limit: int = 50, page: int = 1) -> Optional[Dict]:
-        return self._post("/api/nansen/transactions", 0.01, {"address": address, "chain": chain, "limit": limit, "page": page})
+        return self._post("/api/nansen/transactions", NANSEN_PAYMENT, {"address": address, "chain": chain, "limit": limit, "page": page})
 
     def get_pnl(self, address: str, chain: str = "solana", page: int = 1, per_page: int = 100) -> Optional[Dict]:
-        return self._post("/api/nansen/pnl", 0.01, {"address": address, "chain": chain, "page": page, "per_page": per_page})
+        return self._post("/api/nansen/pnl", NANSEN_PAYMENT, {"address": address, "chain": chain, "page": page, "per_page": per_page})
 
     def get_pnl_summary(self, address: str, chain: str = "solana") -> Optional[Dict]:
-        return self._post("/api/nansen/pnl-summary", 0.01, {"address": address, "chain": chain})
+        return self._post("/api/nansen/pnl-summary", NANSEN_PAYMENT, {"address": address, "chain": chain})
 
     def get_labels(self, address: str, chain: str = "solana") -> Optional[Dict]:
-        return self._post("/api/nansen/labels", 0.01, {"address": address, "chain": chain})
+        return self._cached_post("/api/nansen/labels", NANSEN_PAYMENT, {"address": address, "chain": chain})
 
     def get_smart_money_netflows(self, chains: Optional[List[str]] = None, page: int = 1, per_page: int = 100) -> Optional[Dict]:
-        return self._post("/api/nansen/smart-money-netflows", 0.01, {"chains": chains or ["solana"], "page": page, "per_page": per_page})
+        return self._cached_post("/api/nansen/smart-money-netflows", NANSEN_PAYMENT, {"chains": chains or ["solana"], "page": page, "per_page": per_page})
 
     def get_token_screener(self, chain: str = "solana", filters: Optional[Dict[str, Any]] = None, page: int = 1, per_page: int = 50) -> Optional[Dict]:
         payload = {"chain": chain, "page": page, "per_page": per_page}
         if filters:
             payload.update(filters)
-        return self._post("/api/nansen/token-screener", 0.01, payload)
+        return self._cached_post("/api/nansen/token-screener", NANSEN_PAYMENT, payload)
 
     def get_flows(self, address: str, chain: str = "solana", page: int = 1, per_page: int = 50) -> Optional[Dict]:
-        return self._post("/api/nansen/flows", 0.01, {"address": address, "chain": chain, "page": page, "per_page": per_page})
+        return self._post("/api/nansen/flows", NANSEN_PAYMENT, {"address": address, "chain": chain, "page": page, "per_page": per_page})
 
     def get_flow_intelligence(self, token_address: str, chain: str = "solana") -> Optional[Dict]:
-        return self._post("/api/nansen/flow-intelligence", 0.01, {"token_address": token_address, "chain": chain})
\ No newline at end of file
+        return self._cached_post("/api/nansen/flow-intelligence", NANSEN_PAYMENT, {"token_address": token_address, "chain": chain})
+
+    async def aget_current_balance(self, address: str, chain: str = "solana") -> Optional[Dict]:
+        return await self._acached_post("/api/nansen/current-balance", NANSEN_PAYMENT, {"address": address, "chain": chain})
+
+    async def aget_transactions(self, address: str, chain: str = "solana", limit: int = 50, page: int = 1) -> Optional[Dict]:
+        return await self._apost("/api/nansen/transactions", NANSEN_PAYMENT, {"address": address, "chain": chain, "limit": limit, "page": page})
+
+    async def aget_pnl(self, address: str, chain: str = "solana", page: int = 1, per_page: int = 100) -> Optional[Dict]:
+        return await self._apost("/api/nansen/pnl", NANSEN_PAYMENT, {"address": address, "chain": chain, "page": page, "per_page": per_page})
+
+    async def aget_pnl_summary(self, address: str, chain: str = "solana") -> Optional[Dict]:
+        return await self._apost("/api/nansen/pnl-summary", NANSEN_PAYMENT, {"address": address, "chain": chain})
+
+    async def aget_labels(self, address: str, chain: str = "solana") -> Optional[Dict]:
+        return await self._acached_post("/api/nansen/labels", NANSEN_PAYMENT, {"address": address, "chain": chain})
+
+    async def aget_smart_money_netflows(self, chains: Optional[List[str]] = None, page: int = 1, per_page: int = 100) -> Optional[Dict]:
+        return await self._acached_post("/api/nansen/smart-money-netflows", NANSEN_PAYMENT, {"chains": chains or ["solana"], "page": page, "per_page": per_page})
+
+    async def aget_token_screener(self, chain: str = "solana", filters: Optional[Dict[str, Any]] = None, page: int = 1, per_page: int = 50) -> Optional[Dict]:
+        payload = {"chain": chain, "page": page, "per_page": per_page}
+        if filters:
+            payload.update(filters)
+        return await self._acached_post("/api/nansen/token-screener", NANSEN_PAYMENT, payload)
+
+    async def get_bundle(self, address: str, chain: str = "solana") -> Dict[str, Optional[Dict]]:
+        balance, pnl_summary, labels = await asyncio.gather(
+            self.aget_current_balance(address, chain),
+            self.aget_pnl_summary(address, chain),
+            self.aget_labels(address, chain)
+        )
+        return {"balance": balance, "pnl_summary": pnl_summary, "labels": labels}